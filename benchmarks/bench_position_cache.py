@@ -0,0 +1,95 @@
+"""Repeated self-play benchmark for the shared position cache (src/position_cache.py).
+
+Plays the same set of openings out with the AI at a fixed depth, spread over worker
+processes that share one SQLite cache file: first without a cache, then twice with
+it (cold, then warm). Reports time, plies/sec and cache hit rates for each run.
+
+Usage: python benchmarks/bench_position_cache.py [--depth 2] [--plies 40] [--workers N]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from ai import choose_ai_move
+from chess_clock import TimeBudget
+from chess_game import ChessGame
+from position_cache import CACHE_KINDS, PositionCache
+
+OPENINGS = [
+    ["e2e4", "e7e5", "g1f3", "b8c6"],
+    ["e2e4", "c7c5", "g1f3", "d7d6"],
+    ["d2d4", "d7d5", "c2c4", "e7e6"],
+    ["d2d4", "g8f6", "c2c4", "g7g6"],
+    ["c2c4", "e7e5", "b1c3", "g8f6"],
+    ["g1f3", "d7d5", "g2g3", "c7c5"],
+    ["e2e4", "e7e6", "d2d4", "d7d5"],
+    ["e2e4", "c7c6", "d2d4", "d7d5"],
+]
+NO_TIME_LIMIT = TimeBudget(soft=float("inf"), hard=float("inf"))
+
+def play_game(index: int, opening: list[str], cache: PositionCache, plies: int, depth: int):
+    """Plays one self-play game the way the TUI loop does; returns (plies played, cache hits, cache misses)."""
+    random.seed(index)
+    if cache is not None:
+        # Jobs batched into one pool task share an unpickled cache object: count this game only
+        cache.hits = dict.fromkeys(CACHE_KINDS, 0)
+        cache.misses = dict.fromkeys(CACHE_KINDS, 0)
+    game = ChessGame(cache=cache)
+    for move_uci in opening:
+        game.make_move(move_uci)
+    while len(game.board.move_stack) < plies and game.get_game_status() == "Ongoing":
+        game.get_legal_moves()
+        game.make_move(choose_ai_move(game, NO_TIME_LIMIT, max_depth=depth))
+    if cache is None:
+        return len(game.board.move_stack), None, None
+    return len(game.board.move_stack), dict(cache.hits), dict(cache.misses)
+
+def run(label: str, cache: PositionCache, args):
+    jobs = [(i, opening, cache, args.plies, args.depth) for i, opening in enumerate(OPENINGS)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        results = pool.starmap(play_game, jobs, chunksize=1) # One game per task keeps workers evenly loaded
+    elapsed = time.perf_counter() - start
+
+    total_plies = sum(played for played, _, _ in results)
+    line = f"{label:<12} {elapsed:7.2f} s {total_plies / elapsed:8.1f} plies/s"
+    if cache is not None:
+        # play_game reports per-game counters, so summing them covers every game exactly once
+        hits = {kind: 0 for kind in CACHE_KINDS}
+        misses = {kind: 0 for kind in CACHE_KINDS}
+        for _, game_hits, game_misses in results:
+            for kind in CACHE_KINDS:
+                hits[kind] += game_hits[kind]
+                misses[kind] += game_misses[kind]
+        rates = []
+        for kind in CACHE_KINDS:
+            lookups = hits[kind] + misses[kind]
+            rates.append(f"{kind} {hits[kind] / lookups if lookups else 0:6.1%}")
+        line += "   hit rate: " + ", ".join(rates)
+    print(line)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    print(f"{len(OPENINGS)} openings, {args.plies} plies, depth {args.depth}, {args.workers} workers")
+
+    baseline = run("no cache", None, args)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PositionCache(os.path.join(temp_dir, "positions.sqlite"))
+        run("cold cache", cache, args)
+        warm = run("warm cache", cache, args)
+        print(f"{len(cache)} cached positions; warm run {baseline / warm:.1f}x faster than no cache")
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark for headless rendering (src/render.py) over a 200-ply game.
+
+Usage: python benchmarks/bench_render.py [--plies 200] [--workers N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import render
+from chess_game import ChessGame
+
+def random_game(plies: int, seed: int = 0) -> ChessGame:
+    """A reproducible random game that lasts at least `plies` plies."""
+    while True:
+        rng = random.Random(seed)
+        game = ChessGame()
+        while len(game.board.move_stack) < plies and not game.board.is_game_over(claim_draw=False):
+            game.board.push(rng.choice(list(game.board.legal_moves)))
+        if len(game.board.move_stack) == plies:
+            return game
+        seed += 1
+
+def timed(label: str, frames: int, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<48} {elapsed * 1000:8.1f} ms  {frames / elapsed:8.1f} frames/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plies", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    game = random_game(args.plies)
+    specs = render.build_frame_specs(game)
+    frames = len(specs)
+    print(f"{frames} frames ({args.plies} plies), {args.workers} workers")
+
+    def uncached_live_path():
+        surface = render.init_headless()
+        # What the live GUI does per frame: replay the whole game for the SAN history
+        for spec in specs:
+            frame_game = ChessGame()
+            frame_game.board = game.board.root()
+            for move in game.board.move_stack[:spec.index]:
+                frame_game.board.push(move)
+            render.gui.draw_frame(surface, frame_game)
+
+    timed("build_frame_specs (incremental SAN history)", frames, lambda: render.build_frame_specs(game))
+    # Parallel runs first, while pygame is not yet initialised in this process
+    with tempfile.TemporaryDirectory() as output_dir:
+        timed(f"render to surfaces, {args.workers} processes", frames, lambda: render.render_specs(specs, None, args.workers))
+        timed(f"render + write PNGs, {args.workers} processes", frames, lambda: render.render_specs(specs, output_dir, args.workers))
+        render.draw_spec(render.init_headless(), specs[-1]) # Warm the board layer and text caches
+        timed("render to surfaces, 1 process", frames, lambda: render.render_specs(specs, None, 1))
+        timed("render + write PNGs, 1 process", frames, lambda: render.render_specs(specs, output_dir, 1))
+    timed("draw_frame, history replayed per frame", frames, uncached_live_path)
+
+if __name__ == "__main__":
+    main()
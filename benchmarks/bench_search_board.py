@@ -0,0 +1,134 @@
+"""Perft validation and nodes/sec benchmark for SearchBoard (src/search_board.py).
+
+Checks SearchBoard.perft against published counts for the standard perft positions,
+then compares node rates of:
+  - ChessGame.make_move (UCI parsing + legal move check) with board.pop
+  - plain board.push/pop over board.legal_moves
+  - plain board.push/pop, recomputing the Zobrist hash and eval at every node
+  - SearchBoard pseudo-legal try_push/pop with incremental hash and eval
+and times the AI's iterative-deepening search with and without its transposition
+table, which is keyed by SearchBoard's incremental hash.
+
+Usage: python benchmarks/bench_search_board.py [--depth N] [--search-depth N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import chess.polyglot
+import ai
+from chess_game import ChessGame
+from search_board import SearchBoard, evaluate_board
+
+PERFT_POSITIONS = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862]),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238]),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379]),
+]
+
+def perft_chess_game(game: ChessGame, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move_uci in game.get_legal_moves():
+        game.make_move(move_uci)
+        nodes += perft_chess_game(game, depth - 1)
+        game.board.pop()
+    return nodes
+
+def perft_push_pop(board: chess.Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft_push_pop(board, depth - 1)
+        board.pop()
+    return nodes
+
+def perft_push_pop_recompute(board: chess.Board, depth: int) -> int:
+    # Same information SearchBoard maintains, computed from scratch at every node
+    chess.polyglot.zobrist_hash(board)
+    evaluate_board(board)
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft_push_pop_recompute(board, depth - 1)
+        board.pop()
+    return nodes
+
+def search_to_depth(fen: str, depth: int, table_bits: int):
+    """Iterative deepening to `depth` the way choose_ai_move does it; returns (best move, score)."""
+    search_board = SearchBoard(chess.Board(fen))
+    moves = ai._ordered_moves(search_board.board, list(search_board.board.legal_moves))
+    table = ai._new_table(table_bits)
+    for iteration_depth in range(1, depth + 1):
+        move, score = ai._search_root(search_board, moves, iteration_depth, float("inf"), table)
+        moves.remove(move)
+        moves.insert(0, move)
+    return move, score
+
+def timed(func):
+    start = time.perf_counter()
+    nodes = func()
+    return nodes, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=3, help="Depth for the nodes/sec comparison")
+    parser.add_argument("--search-depth", type=int, default=4, help="Depth for the search comparison")
+    args = parser.parse_args()
+
+    print("Perft validation (SearchBoard vs published counts)")
+    for name, fen, counts in PERFT_POSITIONS:
+        search_board = SearchBoard(chess.Board(fen))
+        for depth, expected in enumerate(counts, start=1):
+            nodes = search_board.perft(depth)
+            status = "ok" if nodes == expected else f"MISMATCH (expected {expected})"
+            print(f"  {name:<12} depth {depth}: {nodes:>8} {status}")
+            if nodes != expected:
+                sys.exit(1)
+
+    print(f"\nNodes/sec at depth {args.depth}")
+    methods = [
+        ("ChessGame.make_move + pop", lambda fen: perft_chess_game(_game(fen), args.depth)),
+        ("board.push/pop", lambda fen: perft_push_pop(chess.Board(fen), args.depth)),
+        ("board.push/pop + full hash/eval", lambda fen: perft_push_pop_recompute(chess.Board(fen), args.depth)),
+        ("SearchBoard incremental", lambda fen: SearchBoard(chess.Board(fen)).perft(args.depth)),
+    ]
+    for label, func in methods:
+        total_nodes, total_time = 0, 0.0
+        for _, fen, _ in PERFT_POSITIONS:
+            nodes, elapsed = timed(lambda: func(fen))
+            total_nodes += nodes
+            total_time += elapsed
+        print(f"  {label:<34} {total_nodes:>9} nodes {total_time:7.2f} s {total_nodes / total_time:>10,.0f} nodes/s")
+
+    print(f"\nAlpha-beta search to depth {args.search_depth}")
+    results = {}
+    # A single slot is overwritten at almost every node, so it stands in for no table at all
+    for label, bits in (("without transposition table", 0), ("with transposition table", ai.TRANSPOSITION_TABLE_BITS)):
+        total_time = 0.0
+        for name, fen, _ in PERFT_POSITIONS:
+            result, elapsed = timed(lambda: search_to_depth(fen, args.search_depth, bits))
+            results.setdefault(name, set()).add(result)
+            total_time += elapsed
+        print(f"  {label:<34} {total_time:7.2f} s")
+    mismatches = [name for name, found in results.items() if len(found) > 1]
+    print("  same best moves and scores" if not mismatches else f"  RESULTS DIFFER: {', '.join(mismatches)}")
+
+def _game(fen: str) -> ChessGame:
+    game = ChessGame()
+    game.board = chess.Board(fen)
+    return game
+
+if __name__ == "__main__":
+    main()
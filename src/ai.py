@@ -0,0 +1,182 @@
+import random
+import time
+import chess
+from chess_clock import TimeBudget
+from search_board import PIECE_VALUES, SearchBoard
+from position_cache import to_signed_key
+
+# Budget used when the game is played without clocks
+DEFAULT_BUDGET = TimeBudget(soft=0.5, hard=1.0)
+
+MATE_SCORE = 100000
+MAX_DEPTH = 32
+# Stop deepening once this share of the soft limit is used: the next iteration would not finish in time
+NEXT_ITERATION_GUARD = 0.5
+# Transposition table of 2**TRANSPOSITION_TABLE_BITS slots per search, indexed by the low bits of
+# the hash; a newer entry replaces whatever shares its slot. A filled slot takes about 180 bytes
+# (measured with tracemalloc), so a full table stays under 50 MB however long the search runs.
+TRANSPOSITION_TABLE_BITS = 18
+
+# Transposition table bounds: how a stored score relates to the node's true score
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+def _new_table(bits: int = TRANSPOSITION_TABLE_BITS) -> list:
+    return [None] * (1 << bits)
+
+
+# Best moves are stored as small ints instead of chess.Move objects to keep table entries compact
+def _encode_move(move: chess.Move) -> int:
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def _decode_move(code: int) -> chess.Move:
+    return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+
+def _ordered_moves(board: chess.Board, moves):
+    # Captures first, most valuable victim first; stable sort keeps the caller's order otherwise
+    def capture_value(move):
+        if not board.is_capture(move):
+            return 0
+        victim = board.piece_at(move.to_square)
+        return PIECE_VALUES[victim.piece_type] if victim else PIECE_VALUES[chess.PAWN]
+    return sorted(moves, key=capture_value, reverse=True)
+
+
+def _negamax(search_board: SearchBoard, depth: int, alpha: int, beta: int, deadline: float, table: list) -> int:
+    if time.perf_counter() >= deadline:
+        raise _SearchTimeout()
+    if depth == 0:
+        return search_board.evaluate()
+
+    # Transpositions and earlier iterations: reuse a deep enough result, else try its best move first
+    key = search_board.hash
+    slot = key & (len(table) - 1)
+    entry = table[slot]
+    table_move = None
+    if entry is not None and entry[0] == key:
+        _, entry_depth, entry_score, entry_bound, move_code = entry
+        if entry_depth >= depth and (entry_bound == EXACT
+                                     or (entry_bound == LOWER_BOUND and entry_score >= beta)
+                                     or (entry_bound == UPPER_BOUND and entry_score <= alpha)):
+            return entry_score
+        if move_code is not None:
+            table_move = _decode_move(move_code)
+
+    # Pseudo-legal moves; legality is only checked for moves reached before a cutoff
+    moves = _ordered_moves(search_board.board, search_board.pseudo_legal_moves())
+    if table_move in moves: # Membership also guards against hash collisions
+        moves.remove(table_move)
+        moves.insert(0, table_move)
+    original_alpha = alpha
+    best, best_move = None, None
+    for move in moves:
+        if not search_board.try_push(move):
+            continue
+        score = -_negamax(search_board, depth - 1, -beta, -alpha, deadline, table)
+        search_board.pop()
+        if best is None or score > best:
+            best, best_move = score, move
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+    if best is None:
+        # Prefer quicker mates: deeper remaining depth means the mate is closer to the root
+        best = -(MATE_SCORE + depth) if search_board.is_check() else 0
+        bound = EXACT
+    elif best <= original_alpha:
+        bound = UPPER_BOUND
+    elif best >= beta:
+        bound = LOWER_BOUND
+    else:
+        bound = EXACT
+    table[slot] = (key, depth, best, bound, None if best_move is None else _encode_move(best_move))
+    return best
+
+
+def _search_root(search_board: SearchBoard, moves, depth: int, deadline: float, table: list):
+    best_move, best_score = None, -MATE_SCORE * 2
+    alpha, beta = -MATE_SCORE * 2, MATE_SCORE * 2
+    for move in moves:
+        search_board.push(move) # Root moves are already legal
+        score = -_negamax(search_board, depth - 1, -beta, -alpha, deadline, table)
+        search_board.pop()
+        if score > best_score:
+            best_move, best_score = move, score
+        if score > alpha:
+            alpha = score
+    return best_move, best_score
+
+
+def choose_ai_move(game, budget: TimeBudget = None, max_depth: int = MAX_DEPTH) -> str:
+    """Picks the AI's move (UCI) with an iterative-deepening alpha-beta search.
+
+    The search stops after `budget.soft` seconds unless the best move changed in the
+    last iteration (an unstable position), in which case it keeps deepening until
+    `budget.hard`, and never goes beyond `max_depth`. A forced move is returned
+    immediately. Returns None if there are no legal moves. Positions are looked up by
+    SearchBoard's incremental Zobrist hash in a transposition table that lives for
+    the whole search, so each iteration starts from the previous one's best moves.
+
+    If the game has a position cache, a cached result is reused: it is returned as is
+    when it already reaches `max_depth`, otherwise the search resumes one ply deeper.
+    The deepest completed result is written back for other games and processes.
+    """
+    budget = budget or DEFAULT_BUDGET
+    start = time.perf_counter()
+    search_board = SearchBoard(game)
+    board = search_board.board
+
+    moves = list(board.legal_moves)
+    if not moves:
+        return None
+    if len(moves) == 1:
+        return moves[0].uci()
+    random.shuffle(moves) # Varies play between equally scored moves
+    moves = _ordered_moves(board, moves)
+    best_move, completed_depth = moves[0], 0
+
+    cache = game.cache
+    cache_key = to_signed_key(search_board.hash) if cache is not None else None
+    if cache is not None:
+        cached = cache.get_search(cache_key)
+        cached_move = chess.Move.from_uci(cached[0]) if cached else None
+        if cached_move in moves: # Also guards against Zobrist collisions
+            cached_score, completed_depth = cached[1], cached[2]
+            best_move = cached_move
+            moves.remove(cached_move)
+            moves.insert(0, cached_move)
+            if completed_depth >= max_depth or abs(cached_score) >= MATE_SCORE:
+                return cached_move.uci()
+    cached_depth = completed_depth
+    if budget.hard <= 0:
+        return best_move.uci()
+
+    deadline = start + budget.hard
+    best_score = None
+    table = _new_table()
+    for depth in range(completed_depth + 1, max_depth + 1):
+        try:
+            move, score = _search_root(search_board, moves, depth, deadline, table)
+        except _SearchTimeout:
+            break
+        best_changed = move != best_move and depth > 1
+        best_move, best_score, completed_depth = move, score, depth
+        moves.remove(move)
+        moves.insert(0, move) # Search the current best move first next iteration
+
+        elapsed = time.perf_counter() - start
+        if abs(score) >= MATE_SCORE:
+            break
+        if not best_changed and elapsed >= budget.soft * NEXT_ITERATION_GUARD:
+            break
+
+    if cache is not None and completed_depth > cached_depth:
+        cache.put_search(cache_key, best_move.uci(), best_score, completed_depth)
+    return best_move.uci()
@@ -0,0 +1,172 @@
+import math
+import time
+from typing import NamedTuple
+import chess
+
+# --- Time management constants ---
+DEFAULT_MOVES_TO_GO = 30      # Assumed remaining moves when the control has no move count
+INCREMENT_USAGE = 0.75        # Fraction of the increment the AI plans to spend each move
+MAX_STRETCH = 3.0             # Hard limit is at most this multiple of the soft limit
+MAX_CLOCK_FRACTION = 0.25     # Never plan to spend more than this share of the remaining time
+CHECK_EXTENSION = 1.5         # In-check positions are tactical, give them more time
+MOVE_OVERHEAD = 0.05          # Seconds kept in reserve for input/rendering latency
+
+
+class TimeControl:
+    """A time control: base time plus increment, optionally renewed every N moves.
+
+    All times are in seconds. `moves_per_period` set to e.g. 40 means the base time
+    is added back to a player's clock after every 40 of their moves (classical "40/90").
+    """
+
+    def __init__(self, base: float, increment: float = 0.0, moves_per_period: int = None):
+        if not (math.isfinite(base) and math.isfinite(increment)):
+            raise ValueError("Times must be finite numbers.")
+        if base <= 0:
+            raise ValueError("Base time must be positive.")
+        if increment < 0:
+            raise ValueError("Increment cannot be negative.")
+        if moves_per_period is not None and moves_per_period <= 0:
+            raise ValueError("Moves per period must be positive.")
+        self.base = float(base)
+        self.increment = float(increment)
+        self.moves_per_period = moves_per_period
+
+    @classmethod
+    def parse(cls, text: str) -> "TimeControl":
+        """Parses "5+3" (minutes + seconds increment), "40/90" or "40/90+30" (moves/minutes)."""
+        text = text.strip()
+        moves_per_period = None
+        if "/" in text:
+            moves_str, text = text.split("/", 1)
+            moves_per_period = int(moves_str)
+        if "+" in text:
+            base_str, increment_str = text.split("+", 1)
+        else:
+            base_str, increment_str = text, "0"
+        return cls(float(base_str) * 60, float(increment_str), moves_per_period)
+
+    def __str__(self):
+        minutes = f"{self.base / 60:g}"
+        prefix = f"{self.moves_per_period}/" if self.moves_per_period else ""
+        suffix = f"+{self.increment:g}" if self.increment else ""
+        return f"{prefix}{minutes}{suffix}"
+
+
+class TimeBudget(NamedTuple):
+    """How long the AI should think: stop after `soft` seconds if the search is stable, never exceed `hard`."""
+    soft: float
+    hard: float
+
+
+class ChessClock:
+    """Two-sided chess clock driven by a monotonic high-resolution timer."""
+
+    def __init__(self, time_control: TimeControl, timer=time.perf_counter):
+        self.time_control = time_control
+        self._timer = timer
+        self._remaining = {chess.WHITE: time_control.base, chess.BLACK: time_control.base}
+        self._moves_made = {chess.WHITE: 0, chess.BLACK: 0}
+        self.running_color = None
+        self._turn_started_at = None
+
+    def start(self, color: chess.Color):
+        """Starts (or switches) the clock to run for `color`."""
+        self._stop_running_side()
+        self.running_color = color
+        self._turn_started_at = self._timer()
+
+    def stop(self):
+        self._stop_running_side()
+        self.running_color = None
+
+    def press(self) -> float:
+        """Ends the running side's move: charges the time used, applies the increment
+        and period bonus, then starts the opponent's clock. Returns the seconds spent."""
+        color = self.running_color
+        if color is None:
+            raise RuntimeError("Clock is not running.")
+        spent = self._timer() - self._turn_started_at
+        self._stop_running_side()
+        if self._remaining[color] > 0:
+            tc = self.time_control
+            self._moves_made[color] += 1
+            self._remaining[color] += tc.increment
+            if tc.moves_per_period and self._moves_made[color] % tc.moves_per_period == 0:
+                self._remaining[color] += tc.base
+        self.running_color = not color
+        self._turn_started_at = self._timer()
+        return spent
+
+    def remaining(self, color: chess.Color) -> float:
+        """Seconds left for `color`, including the time elapsed on a running clock."""
+        remaining = self._remaining[color]
+        if color == self.running_color:
+            remaining -= self._timer() - self._turn_started_at
+        return max(0.0, remaining)
+
+    def flagged(self, color: chess.Color) -> bool:
+        return self.remaining(color) <= 0
+
+    def moves_to_go(self, color: chess.Color) -> int:
+        """Moves left in the current period, or an estimate when the control has no move count."""
+        period = self.time_control.moves_per_period
+        if period:
+            return period - self._moves_made[color] % period
+        return DEFAULT_MOVES_TO_GO
+
+    def timeout_message(self, board: chess.Board) -> str:
+        """Returns the result text if either side has run out of time, else None."""
+        for color in (board.turn, not board.turn):
+            if self.flagged(color):
+                loser = "White" if color == chess.WHITE else "Black"
+                if board.has_insufficient_material(not color):
+                    return f"Draw: {loser} flagged, no mating material"
+                winner = "Black" if color == chess.WHITE else "White"
+                return f"{loser} lost on time. {winner} wins."
+        return None
+
+    def display(self) -> str:
+        return f"White {format_clock_time(self.remaining(chess.WHITE))} | Black {format_clock_time(self.remaining(chess.BLACK))}"
+
+    def _stop_running_side(self):
+        if self.running_color is not None:
+            elapsed = self._timer() - self._turn_started_at
+            self._remaining[self.running_color] = max(0.0, self._remaining[self.running_color] - elapsed)
+            self._turn_started_at = self._timer()
+
+
+def format_clock_time(seconds: float) -> str:
+    """Formats seconds as h:mm:ss, m:ss, or m:ss.t once under ten seconds."""
+    if seconds < 10:
+        return f"0:{seconds:04.1f}"
+    total = int(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def allocate_move_time(clock: ChessClock, board: chess.Board) -> TimeBudget:
+    """Works out the AI's thinking budget for the side to move from its remaining clock.
+
+    Forced moves get no time at all. Positions in check are treated as unstable and get
+    a longer soft limit; the search itself may stretch towards the hard limit when its
+    best move keeps changing between iterations.
+    """
+    color = board.turn
+    legal_move_count = board.legal_moves.count()
+    if legal_move_count <= 1:
+        return TimeBudget(0.0, 0.0)
+
+    remaining = max(0.0, clock.remaining(color) - MOVE_OVERHEAD)
+    increment = clock.time_control.increment
+    soft = remaining / clock.moves_to_go(color) + INCREMENT_USAGE * increment
+    if board.is_check():
+        soft *= CHECK_EXTENSION
+
+    hard_cap = remaining * MAX_CLOCK_FRACTION + INCREMENT_USAGE * increment
+    hard_cap = min(hard_cap, remaining)
+    hard = min(soft * MAX_STRETCH, hard_cap)
+    return TimeBudget(min(soft, hard), hard)
@@ -1,8 +1,19 @@
 import chess
+import chess.polyglot
+try:
+    from position_cache import to_signed_key
+except ImportError: # Imported as src.chess_game, with only the repository root on sys.path
+    from .position_cache import to_signed_key
 
 class ChessGame:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.board = chess.Board()
+        # Optional PositionCache (see position_cache.py) shared with other games and processes
+        self.cache = cache
+
+    def position_key(self) -> int:
+        """Zobrist hash of the current position as a signed 64-bit cache key."""
+        return to_signed_key(chess.polyglot.zobrist_hash(self.board))
 
     def make_move(self, move_uci: str) -> bool:
         try:
@@ -18,6 +29,7 @@ class ChessGame:
         return str(self.board)
 
     def get_game_status(self) -> str:
+        # Not cached: these checks are cheaper than hashing the position for a cache lookup
         if self.board.is_checkmate():
             return "Checkmate"
         if self.board.is_stalemate():
@@ -31,7 +43,14 @@ class ChessGame:
         return "Ongoing"
 
     def get_legal_moves(self) -> list[str]:
-        return [move.uci() for move in self.board.legal_moves]
+        if self.cache is None:
+            return [move.uci() for move in self.board.legal_moves]
+        key = self.position_key()
+        legal_moves = self.cache.get_legal_moves(key)
+        if legal_moves is None:
+            legal_moves = [move.uci() for move in self.board.legal_moves]
+            self.cache.put_legal_moves(key, legal_moves)
+        return legal_moves
 
     def get_move_history_san(self) -> list[str]:
         """Returns the game's move history in Standard Algebraic Notation (SAN)."""
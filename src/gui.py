@@ -1,8 +1,10 @@
 import pygame as pg
 import chess
 import os
-import random # For AI
+import threading
 from chess_game import ChessGame # Import ChessGame
+from chess_clock import ChessClock, allocate_move_time, format_clock_time
+from ai import choose_ai_move
 
 # --- Constants ---
 BOARD_WIDTH = 480  # Was SCREEN_WIDTH
@@ -11,6 +13,7 @@ SQUARE_SIZE = BOARD_WIDTH // 8
 
 HISTORY_WIDTH = 200
 INFO_HEIGHT = 40
+INFO_PADDING = 8 # Gap between the info bar's edges, clocks and status text
 
 SCREEN_WIDTH = BOARD_WIDTH + HISTORY_WIDTH
 SCREEN_HEIGHT = BOARD_HEIGHT + INFO_HEIGHT # Renamed from TOTAL_HEIGHT for clarity
@@ -24,12 +27,21 @@ HIGHLIGHT_COLOR = (255, 255, 51, 150)
 LEGAL_MOVE_HIGHLIGHT_COLOR = (0, 255, 0, 100)
 HISTORY_BG_COLOR = (200, 200, 200) # Light grey for history panel
 HISTORY_TEXT_COLOR = (0, 0, 0)
+CLOCK_ACTIVE_COLOR = (255, 215, 0)   # Clock of the side to move
+CLOCK_IDLE_COLOR = (150, 150, 150)
+CLOCK_LOW_COLOR = (255, 80, 80)      # Less than LOW_TIME_SECONDS left
+LOW_TIME_SECONDS = 10
 
 # --- Asset Loading & Font ---
 PIECE_IMAGES = {}
 INFO_FONT = None
 HISTORY_FONT = None
 
+# --- Render caches ---
+BOARD_LAYER = None # Pre-drawn empty 8x8 board, built on first use
+TEXT_CACHE = {}    # (font, text, color) -> rendered surface
+TEXT_CACHE_MAX_ENTRIES = 1024
+
 def init_pygame_essentials():
     global INFO_FONT, HISTORY_FONT
     pg.init()
@@ -56,7 +68,11 @@ def load_piece_images():
             try:
                 image = pg.image.load(path)
                 image = pg.transform.scale(image, (SQUARE_SIZE, SQUARE_SIZE))
-                PIECE_IMAGES[f"{color}{symbol}"] = image
+                # Copy into pygame's native 32-bit alpha layout so every blit takes the fast path
+                # (convert_alpha() would need a display mode, which isn't set yet or is headless)
+                native_image = pg.Surface((SQUARE_SIZE, SQUARE_SIZE), pg.SRCALPHA, 32)
+                native_image.blit(image, (0, 0))
+                PIECE_IMAGES[f"{color}{symbol}"] = native_image
             except pg.error as e:
                 print(f"Error loading piece image {path}: {e}")
     if not PIECE_IMAGES:
@@ -72,14 +88,38 @@ def get_piece_symbol_from_chess_piece(piece: chess.Piece):
     symbol = piece.symbol().upper()
     return f"{color}{symbol}"
 
+def get_board_layer():
+    # The empty board never changes, so draw its 64 squares once and blit the result
+    global BOARD_LAYER
+    if BOARD_LAYER is None:
+        BOARD_LAYER = pg.Surface((BOARD_WIDTH, BOARD_HEIGHT))
+        for rank_idx in range(8):
+            for file_idx in range(8):
+                square_color = LIGHT_SQUARE if (rank_idx + file_idx) % 2 == 0 else DARK_SQUARE
+                pg.draw.rect(BOARD_LAYER, square_color, (file_idx * SQUARE_SIZE, rank_idx * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+    return BOARD_LAYER
+
+def render_text(font, text: str, color, max_width: int = None):
+    # Move-history lines and status messages repeat from frame to frame; reuse their surfaces
+    key = (font, text, color, max_width)
+    text_surface = TEXT_CACHE.get(key)
+    if text_surface is None:
+        if len(TEXT_CACHE) >= TEXT_CACHE_MAX_ENTRIES:
+            TEXT_CACHE.clear()
+        text_surface = font.render(text, True, color)
+        if max_width is not None and text_surface.get_width() > max_width:
+            # Shrink text that would not fit, keeping its aspect ratio
+            height = max(1, text_surface.get_height() * max_width // text_surface.get_width())
+            text_surface = pg.transform.smoothscale(text_surface, (max_width, height))
+        TEXT_CACHE[key] = text_surface
+    return text_surface
+
 def draw_board_and_pieces(screen, game: ChessGame, selected_square_idx=None, legal_moves_for_selected=[]):
     # Draws only the 8x8 board and pieces, not the whole screen
     board_surface = screen.subsurface(pg.Rect(0, 0, BOARD_WIDTH, BOARD_HEIGHT))
+    board_surface.blit(get_board_layer(), (0, 0))
     for rank_idx in range(8):
         for file_idx in range(8):
-            square_color = LIGHT_SQUARE if (rank_idx + file_idx) % 2 == 0 else DARK_SQUARE
-            pg.draw.rect(board_surface, square_color, (file_idx * SQUARE_SIZE, rank_idx * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-
             current_square_chess_idx = chess.square(file_idx, 7 - rank_idx)
 
             if selected_square_idx is not None and current_square_chess_idx == selected_square_idx:
@@ -98,12 +138,13 @@ def draw_board_and_pieces(screen, game: ChessGame, selected_square_idx=None, leg
                 if piece_img_key in PIECE_IMAGES:
                     board_surface.blit(PIECE_IMAGES[piece_img_key], (file_idx * SQUARE_SIZE, rank_idx * SQUARE_SIZE))
 
-def draw_info_bar(screen, game: ChessGame):
-    # Draws the info/status message bar below the board
+def draw_info_bar(screen, game: ChessGame, chess_clock: ChessClock = None):
+    # Draws the info/status message bar below the board, with the clocks at either end
     info_bar_rect = pg.Rect(0, BOARD_HEIGHT, BOARD_WIDTH, INFO_HEIGHT) # Spans only board width now
     pg.draw.rect(screen, BLACK_COLOR, info_bar_rect)
 
-    status_text = game.get_game_status()
+    game_status = game.get_game_status()
+    status_text = game_status
     turn_text = ""
     if status_text == "Ongoing":
         turn_text = "White's Turn" if game.board.turn == chess.WHITE else "Black's Turn"
@@ -117,18 +158,52 @@ def draw_info_bar(screen, game: ChessGame):
     elif status_text == "Stalemate" or "Draw by" in status_text:
          status_text = f"Draw: {status_text}"
 
+    game_over = game_status != "Ongoing"
+    if chess_clock and not game_over:
+        timeout_message = chess_clock.timeout_message(game.board)
+        if timeout_message:
+            status_text = timeout_message
+            game_over = True
+
     if INFO_FONT:
-        text_surface = INFO_FONT.render(status_text, True, WHITE_COLOR)
-        text_rect = text_surface.get_rect(center=info_bar_rect.center)
+        text_area = info_bar_rect.inflate(-2 * INFO_PADDING, 0)
+        if chess_clock and not game_over:
+            # Once the game is over the clocks no longer matter: the result gets the whole bar
+            clock_width = draw_clocks(screen, info_bar_rect, game, chess_clock)
+            text_area = info_bar_rect.inflate(-2 * (clock_width + 2 * INFO_PADDING), 0)
+        text_surface = render_text(INFO_FONT, status_text, WHITE_COLOR, text_area.width)
+        screen.blit(text_surface, text_surface.get_rect(center=text_area.center))
+
+def draw_clocks(screen, info_bar_rect, game: ChessGame, chess_clock: ChessClock) -> int:
+    # Draws both clocks at the ends of the info bar; returns the width of the wider one
+    padding = INFO_PADDING
+    widest = 0
+    for color, anchor in ((chess.WHITE, "midleft"), (chess.BLACK, "midright")):
+        remaining = chess_clock.remaining(color)
+        if remaining < LOW_TIME_SECONDS:
+            clock_color = CLOCK_LOW_COLOR
+        elif color == game.board.turn:
+            clock_color = CLOCK_ACTIVE_COLOR
+        else:
+            clock_color = CLOCK_IDLE_COLOR
+        text_surface = INFO_FONT.render(format_clock_time(remaining), True, clock_color)
+        if anchor == "midleft":
+            text_rect = text_surface.get_rect(midleft=(info_bar_rect.left + padding, info_bar_rect.centery))
+        else:
+            text_rect = text_surface.get_rect(midright=(info_bar_rect.right - padding, info_bar_rect.centery))
         screen.blit(text_surface, text_rect)
+        widest = max(widest, text_rect.width)
+    return widest
 
-def draw_move_history(screen, game: ChessGame):
+def draw_move_history(screen, game: ChessGame, move_history_san: list[str] = None):
+    # `move_history_san` lets callers that already know the history skip replaying the game
     history_panel_rect = pg.Rect(BOARD_WIDTH, 0, HISTORY_WIDTH, SCREEN_HEIGHT) # Full height next to board
     pg.draw.rect(screen, HISTORY_BG_COLOR, history_panel_rect)
 
     if not HISTORY_FONT: return
 
-    move_history_san = game.get_move_history_san()
+    if move_history_san is None:
+        move_history_san = game.get_move_history_san()
 
     padding = 5
     line_height = HISTORY_FONT.get_linesize()
@@ -139,19 +214,38 @@ def draw_move_history(screen, game: ChessGame):
         start_index = len(move_history_san) - max_lines
 
     for i, move_str in enumerate(move_history_san[start_index:]):
-        text_surface = HISTORY_FONT.render(move_str, True, HISTORY_TEXT_COLOR)
+        text_surface = render_text(HISTORY_FONT, move_str, HISTORY_TEXT_COLOR)
         screen.blit(text_surface, (BOARD_WIDTH + padding, padding + i * line_height))
 
-def draw_everything(screen, game: ChessGame, selected_square_idx=None, legal_moves_for_selected=[]):
-    screen.fill(BLACK_COLOR) # Fill whole background
-    draw_board_and_pieces(screen, game, selected_square_idx, legal_moves_for_selected)
-    draw_info_bar(screen, game)
-    draw_move_history(screen, game)
+def draw_frame(surface, game: ChessGame, selected_square_idx=None, legal_moves_for_selected=[], chess_clock: ChessClock = None, move_history_san: list[str] = None):
+    # Draws the full window contents onto any surface (the display or an off-screen one)
+    surface.fill(BLACK_COLOR) # Fill whole background
+    draw_board_and_pieces(surface, game, selected_square_idx, legal_moves_for_selected)
+    draw_info_bar(surface, game, chess_clock)
+    draw_move_history(surface, game, move_history_san)
+
+def draw_everything(screen, game: ChessGame, selected_square_idx=None, legal_moves_for_selected=[], chess_clock: ChessClock = None):
+    draw_frame(screen, game, selected_square_idx, legal_moves_for_selected, chess_clock)
     pg.display.flip()
 
 
 # --- Main GUI Game Function ---
-def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Color = chess.WHITE):
+def start_ai_search(game: ChessGame, budget=None):
+    """Runs choose_ai_move on a snapshot of the game in a background thread, so the event
+    loop keeps handling the window and redrawing the running clocks while the AI thinks.
+    Returns (thread, result); result["move"] holds the UCI move once the thread has finished.
+    """
+    snapshot = ChessGame(cache=game.cache)
+    snapshot.board = game.board.copy()
+    result = {}
+    def search():
+        result["move"] = choose_ai_move(snapshot, budget)
+    # Daemon: closing the window mid-search must not wait for the search to run out of time
+    thread = threading.Thread(target=search, name="ai-search", daemon=True)
+    thread.start()
+    return thread, result
+
+def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Color = chess.WHITE, chess_clock: ChessClock = None):
     init_pygame_essentials()
     if not PIECE_IMAGES: return
 
@@ -161,8 +255,11 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
         ai_color = not player_color_choice
 
     selected_square_idx = None
+    ai_search = None # (thread, result) while the AI is thinking
     running = True
     clock = pg.time.Clock()
+    if chess_clock:
+        chess_clock.start(game.board.turn)
 
     while running:
         current_player_turn = game.board.turn
@@ -180,35 +277,29 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
             else:
                 selected_square_idx = None
 
-        # AI's turn logic (remains the same)
-        if game_mode == "ai" and current_player_turn == ai_color and game.get_game_status() == "Ongoing":
-            # ... (AI logic as previously updated)
-            print("AI's turn...")
-            legal_uci_moves = game.get_legal_moves()
-            if legal_uci_moves:
-                capturing_moves = []
-                for move_uci_str in legal_uci_moves:
-                    move_obj = game.board.parse_uci(move_uci_str)
-                    if game.board.is_capture(move_obj):
-                        capturing_moves.append(move_uci_str)
-
-                if capturing_moves:
-                    ai_move_uci = random.choice(capturing_moves)
-                    print("AI (GUI) chose a capturing move.")
+        # AI's turn logic: think in the background for as long as the clock allows, not a fixed delay
+        if game_mode == "ai" and current_player_turn == ai_color and game.get_game_status() == "Ongoing" \
+                and not (chess_clock and chess_clock.timeout_message(game.board)):
+            if ai_search is None:
+                print("AI's turn...")
+                budget = allocate_move_time(chess_clock, game.board) if chess_clock else None
+                ai_search = start_ai_search(game, budget)
+            elif not ai_search[0].is_alive():
+                ai_move_uci = ai_search[1].get("move")
+                ai_search = None
+                if ai_move_uci:
+                    try:
+                        ai_move_san = game.board.san(game.board.parse_uci(ai_move_uci))
+                        print(f"AI plays: {ai_move_san} ({ai_move_uci})")
+                    except Exception:
+                        print(f"AI plays: {ai_move_uci} (SAN conversion failed)")
+
+                    game.make_move(ai_move_uci)
+                    if chess_clock:
+                        chess_clock.press()
+                    selected_square_idx = None
                 else:
-                    ai_move_uci = random.choice(legal_uci_moves)
-
-                try:
-                    ai_move_san = game.board.san(game.board.parse_uci(ai_move_uci))
-                    print(f"AI plays: {ai_move_san} ({ai_move_uci})")
-                except Exception:
-                    print(f"AI plays: {ai_move_uci} (SAN conversion failed)")
-
-                game.make_move(ai_move_uci)
-                selected_square_idx = None
-            else:
-                print("AI has no legal moves.")
-            pg.time.wait(500)
+                    print("AI has no legal moves.")
 
 
         # Event handling (remains mostly the same)
@@ -220,6 +311,9 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
             if game_mode == "ai" and current_player_turn == ai_color:
                 is_player_turn = False
 
+            if chess_clock and chess_clock.timeout_message(game.board):
+                is_player_turn = False
+
             if is_player_turn and event.type == pg.MOUSEBUTTONDOWN and game.get_game_status() == "Ongoing":
                 if event.button == 1:
                     mouse_x, mouse_y = event.pos
@@ -247,6 +341,8 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
                                 move_uci += 'q'
 
                         if game.make_move(move_uci):
+                            if chess_clock:
+                                chess_clock.press()
                             selected_square_idx = None
                         elif piece_on_clicked_square and piece_on_clicked_square.color == current_player_turn:
                             selected_square_idx = square_clicked_idx
@@ -255,10 +351,11 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
                             selected_square_idx = None
 
         # Draw all elements
-        draw_everything(screen, game, selected_square_idx, legal_moves_for_display)
+        draw_everything(screen, game, selected_square_idx, legal_moves_for_display, chess_clock)
 
         current_game_status = game.get_game_status()
-        if current_game_status != "Ongoing":
+        timeout_message = chess_clock.timeout_message(game.board) if chess_clock and current_game_status == "Ongoing" else None
+        if current_game_status != "Ongoing" or timeout_message:
             # Prepare final message based on status
             final_message_display = current_game_status
             if current_game_status == "Checkmate":
@@ -266,10 +363,14 @@ def run_gui_game(game: ChessGame, game_mode: str, player_color_choice: chess.Col
                 final_message_display = f"Checkmate! {winner_color} wins."
             elif current_game_status == "Stalemate" or "Draw by" in current_game_status:
                 final_message_display = f"Draw: {current_game_status}"
+            if timeout_message:
+                final_message_display = timeout_message
+            if chess_clock:
+                chess_clock.stop()
 
             # Re-call draw_everything to ensure the final board state and message are displayed
             # The info bar within draw_everything will use the latest game status.
-            draw_everything(screen, game, None, [])
+            draw_everything(screen, game, None, [], chess_clock)
             print(f"Game Over: {final_message_display}")
             pg.time.wait(3000)
             running = False
@@ -1,6 +1,10 @@
+import os
+import sqlite3
 from chess_game import ChessGame
+from position_cache import PositionCache
+from chess_clock import ChessClock, TimeControl, allocate_move_time
+from ai import choose_ai_move
 import chess
-import random
 import gui # Import the gui module
 
 def get_player_name_tui(turn, game_mode, player_color_choice=None):
@@ -12,12 +16,14 @@ def get_player_name_tui(turn, game_mode, player_color_choice=None):
     else:
         return "AI"
 
-def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Color = None):
+def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Color = None, chess_clock: ChessClock = None):
     """Handles the Text-based User Interface game loop."""
     print("Starting Text-Based Chess Game!")
     ai_color = None
     if game_mode == "ai":
         ai_color = not player_color_choice
+    if chess_clock:
+        chess_clock.start(game.board.turn)
 
     while True:
         print("\n" + "="*20)
@@ -27,6 +33,13 @@ def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Co
         status = game.get_game_status()
         print(f"Status: {status}")
 
+        if chess_clock:
+            timeout_message = chess_clock.timeout_message(game.board)
+            if status == "Ongoing" and timeout_message:
+                print(f"Game over: {timeout_message}")
+                break
+            print(f"Clock: {chess_clock.display()}")
+
         if status != "Ongoing":
             if status == "Checkmate":
                 winner_is_player = False
@@ -45,34 +58,28 @@ def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Co
 
         if current_turn_is_ai:
             print(f"{current_player_display_name}'s turn...")
-            legal_moves = game.get_legal_moves()
-            if not legal_moves:
+            budget = allocate_move_time(chess_clock, game.board) if chess_clock else None
+            ai_move_uci = choose_ai_move(game, budget)
+            if ai_move_uci is None:
                 print("Error: AI has no legal moves but game is ongoing.")
                 break
 
-            # AI Improvement: Prefer Captures
-            capturing_moves = []
-            for move_uci_str in legal_moves:
-                move_obj = game.board.parse_uci(move_uci_str)
-                if game.board.is_capture(move_obj):
-                    capturing_moves.append(move_uci_str)
-
-            if capturing_moves:
-                ai_move_uci = random.choice(capturing_moves)
-                print("AI chose a capturing move.")
-            else:
-                ai_move_uci = random.choice(legal_moves)
-                # print("AI chose a non-capturing move.") # Optional debug
-
             try:
                 ai_move_san = game.board.san(game.board.parse_uci(ai_move_uci))
                 print(f"AI plays: {ai_move_san}")
             except Exception:
                 print(f"AI plays: {ai_move_uci} (SAN conversion failed)")
             game.make_move(ai_move_uci)
+            if chess_clock:
+                chess_clock.press()
         else: # Player's turn
             while True:
-                move_san = input(f"{current_player_display_name}, enter your move (e.g., e4, Nf3, O-O): ")
+                clock_prefix = f"[{chess_clock.display()}] " if chess_clock else ""
+                move_san = input(f"{clock_prefix}{current_player_display_name}, enter your move (e.g., e4, Nf3, O-O): ")
+                # The clock kept running while waiting for input: a move entered after the flag fell does not count
+                if chess_clock and chess_clock.flagged(game.board.turn):
+                    print(f"Game over: {chess_clock.timeout_message(game.board)}")
+                    return
                 try:
                     move_uci = game.board.parse_san(move_san).uci() # Converts SAN to UCI
                     # Check for promotion for player move (simple auto-queen)
@@ -84,6 +91,8 @@ def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Co
                             move_uci += 'q' # Auto-promote to queen
 
                     if game.make_move(move_uci):
+                        if chess_clock:
+                            chess_clock.press()
                         break
                     else:
                         print("Invalid move. The move is not legal in the current position. Try again.")
@@ -95,7 +104,15 @@ def tui_game_loop(game: ChessGame, game_mode: str, player_color_choice: chess.Co
                     print(f"An unexpected error occurred: {e}. Try again.")
 
 def main():
-    game = ChessGame()
+    # Point CHESS_POSITION_CACHE at a file to reuse positions and AI results across games
+    cache_path = os.environ.get("CHESS_POSITION_CACHE")
+    cache = None
+    if cache_path:
+        try:
+            cache = PositionCache(cache_path)
+        except sqlite3.Error as e:
+            print(f"Position cache disabled: cannot open {cache_path} ({e}).")
+    game = ChessGame(cache=cache)
     print("Welcome to Chess!")
 
     ui_choice = ""
@@ -115,12 +132,26 @@ def main():
         ai_opponent_color_name = "Black" if player_color_choice == chess.WHITE else "White"
         print(f"You are playing as {player_color_str.capitalize()}. AI is {ai_opponent_color_name}.")
 
+    chess_clock = None
+    while True:
+        time_control_str = input("Time control, e.g. 5+3 (minutes+increment) or 40/90 (moves/minutes); leave empty for none: ")
+        if not time_control_str.strip():
+            break
+        try:
+            time_control = TimeControl.parse(time_control_str)
+        except ValueError:
+            print("Invalid time control. Try again.")
+            continue
+        chess_clock = ChessClock(time_control)
+        print(f"Playing with time control {time_control}.")
+        break
+
     if ui_choice == "gui":
         print("Starting GUI game...")
         # Ensure gui module is found, might need to adjust path if running from root vs src
         try:
             # import src.gui as gui # This was the old way
-            gui.run_gui_game(game, game_mode, player_color_choice) # gui should be imported at the top
+            gui.run_gui_game(game, game_mode, player_color_choice, chess_clock) # gui should be imported at the top
         except ImportError:
              print("Error: Could not import the GUI module. Make sure it's in the 'src' directory.")
         except Exception as e:
@@ -128,7 +159,7 @@ def main():
             print("If it's a display error, ensure you have a display server (e.g., X11) running if not on a desktop.")
 
     else: # Text-based game
-        tui_game_loop(game, game_mode, player_color_choice)
+        tui_game_loop(game, game_mode, player_color_choice, chess_clock)
 
     print("Thanks for playing!")
 
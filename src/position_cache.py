@@ -0,0 +1,180 @@
+"""Persistent position cache shared across games and processes.
+
+Entries are keyed by the Polyglot Zobrist hash of a position (the same hash SearchBoard
+maintains) and stored in a local SQLite database in WAL mode, so any number of
+processes can read while another writes. Each process opens its own connection.
+
+The database is bounded: entries older than `max_age` seconds are dropped, and when
+there are more than `max_entries` the least recently used ones go first. Reads only
+refresh an entry's last-used time every TOUCH_INTERVAL seconds, so the LRU order is
+approximate but cache hits stay read-only.
+
+Once opened, the cache never raises into gameplay: a database that is busy, locked,
+full or corrupt turns reads into misses and writes into no-ops, counted in stats().
+"""
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_MAX_AGE = 30 * 24 * 3600 # Seconds
+EVICTION_INTERVAL = 1000         # Writes between eviction passes
+EVICTION_TARGET = 0.9            # Evict down to this share of max_entries, so passes are rare
+TOUCH_INTERVAL = 60              # Seconds between last-used refreshes of a hot entry
+BUSY_TIMEOUT_MS = 5000           # How long a writer waits for another process's write lock
+
+CACHE_KINDS = ("legal_moves", "search")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key INTEGER PRIMARY KEY, -- Polyglot Zobrist hash as a signed 64-bit integer
+    legal_moves TEXT,        -- Space-separated UCI moves
+    best_move TEXT,          -- Best move found by the AI search
+    score INTEGER,           -- Its score in centipawns, side to move's point of view
+    depth INTEGER,           -- Search depth that produced it
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS positions_last_used ON positions (last_used);
+"""
+
+
+def to_signed_key(zobrist_hash: int) -> int:
+    """Maps a 64-bit Zobrist hash into SQLite's signed integer range."""
+    return zobrist_hash - (1 << 64) if zobrist_hash >= (1 << 63) else zobrist_hash
+
+
+class PositionCache:
+    """Legal moves and AI search results, keyed by to_signed_key(zobrist_hash)."""
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._local = threading.local()
+        self._writes_since_eviction = 0
+        self.hits = dict.fromkeys(CACHE_KINDS, 0)
+        self.misses = dict.fromkeys(CACHE_KINDS, 0)
+        self.errors = 0
+        self._connection() # Create the database up front so configuration errors surface here
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork() or threads: each process and thread opens its own
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL") # Durable across process crashes; fine for a cache
+            connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            connection.executescript(_SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def close(self):
+        """Closes the calling thread's connection; the next lookup reopens it."""
+        local = self._local
+        if getattr(local, "pid", None) == os.getpid():
+            local.connection.close()
+        local.connection = None
+        local.pid = None
+
+    def __getstate__(self):
+        # Pickled into worker processes without the connection; each worker opens its own
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Reads ---
+    def _get(self, kind: str, key: int, columns: str):
+        try:
+            row = self._connection().execute(f"SELECT {columns}, last_used FROM positions WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            row = None
+        if row is None or row[0] is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        now = time.time()
+        if now - row[-1] > TOUCH_INTERVAL:
+            try:
+                self._connection().execute("UPDATE positions SET last_used = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                self.errors += 1 # The hit stands; the entry just looks older to eviction
+        return row[:-1]
+
+    def get_legal_moves(self, key: int) -> list[str]:
+        row = self._get("legal_moves", key, "legal_moves")
+        return None if row is None else row[0].split()
+
+    def get_search(self, key: int):
+        """Returns (best_move_uci, score, depth) or None."""
+        return self._get("search", key, "best_move, score, depth")
+
+    # --- Writes ---
+    def _put(self, sql: str, params: tuple):
+        try:
+            self._connection().execute(sql, params)
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= EVICTION_INTERVAL:
+                self.evict()
+        except sqlite3.Error:
+            self.errors += 1 # Not cached this time; the caller already has its result
+
+    def put_legal_moves(self, key: int, legal_moves: list[str]):
+        self._put("INSERT INTO positions (key, legal_moves, last_used) VALUES (?, ?, ?) "
+                  "ON CONFLICT (key) DO UPDATE SET legal_moves = excluded.legal_moves, last_used = excluded.last_used",
+                  (key, " ".join(legal_moves), time.time()))
+
+    def put_search(self, key: int, best_move: str, score: int, depth: int):
+        """Stores a search result unless a deeper one is already cached."""
+        self._put("INSERT INTO positions (key, best_move, score, depth, last_used) VALUES (?, ?, ?, ?, ?) "
+                  "ON CONFLICT (key) DO UPDATE SET best_move = excluded.best_move, score = excluded.score, "
+                  "depth = excluded.depth, last_used = excluded.last_used "
+                  "WHERE positions.depth IS NULL OR excluded.depth >= positions.depth",
+                  (key, best_move, score, depth, time.time()))
+
+    # --- Maintenance ---
+    def evict(self):
+        """Drops entries older than max_age, then least recently used ones beyond max_entries."""
+        self._writes_since_eviction = 0
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM positions WHERE last_used < ?", (time.time() - self.max_age,))
+            (entries,) = connection.execute("SELECT COUNT(*) FROM positions").fetchone()
+            if entries > self.max_entries:
+                excess = entries - int(self.max_entries * EVICTION_TARGET)
+                connection.execute("DELETE FROM positions WHERE key IN "
+                                   "(SELECT key FROM positions ORDER BY last_used LIMIT ?)", (excess,))
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction: # SQLite may already have rolled back, e.g. on a full disk
+                connection.execute("ROLLBACK")
+            raise
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Hit/miss counts of this process, overall and per kind of lookup, and database errors absorbed."""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "errors": self.errors,
+            "by_kind": {kind: {"hits": self.hits[kind], "misses": self.misses[kind]} for kind in CACHE_KINDS},
+        }
@@ -0,0 +1,236 @@
+"""Headless rendering of games to per-ply PNG frames, animated GIFs or MP4 videos.
+
+Frames are drawn with the same functions as the live GUI (gui.draw_frame) onto
+off-screen surfaces under SDL's dummy video driver, so no display is needed.
+
+Usage: python render.py game.pgn out_dir [--gif out.gif] [--mp4 out.mp4] [--workers N]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # Must be set before pygame initialises video
+# SDL otherwise swallows SIGINT/SIGTERM, so neither Ctrl+C nor Pool.terminate() could stop a renderer
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import argparse
+import collections
+import io
+import multiprocessing
+import shutil
+import subprocess
+import chess
+import chess.pgn
+import pygame as pg
+import gui
+from chess_game import ChessGame
+
+DEFAULT_FRAME_DURATION_MS = 500
+# Raw frame layout handed to Pillow/ffmpeg. Padded RGBX copies straight out of the 32-bit
+# surface, packed RGB needs a per-pixel conversion that costs as much as drawing the frame.
+FRAME_BYTES_FORMAT = "RGBX"
+FRAMES_PER_TASK = 8         # Consecutive frames a worker renders per task
+TASKS_AHEAD_PER_WORKER = 2  # Tasks in flight per worker: keeps workers busy without buffering the whole game
+
+# Worker processes are spawned, never forked: a fork of a process that already
+# initialised SDL can inherit its locks held and deadlock
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+# Per-process render state, set up once by init_headless()
+_FRAME_SURFACE = None
+
+
+class FrameSpec:
+    """Everything needed to draw one frame, small enough to ship to a worker process."""
+
+    def __init__(self, index: int, fen: str, last_move_square: int, move_history_san: list[str]):
+        self.index = index
+        self.fen = fen
+        self.last_move_square = last_move_square # Highlighted like a selected square, None for the start position
+        self.move_history_san = move_history_san
+
+
+def init_headless():
+    """Initialises pygame, fonts, piece images and the reusable frame surface for this process."""
+    global _FRAME_SURFACE
+    if _FRAME_SURFACE is None:
+        gui.init_pygame_essentials()
+        _FRAME_SURFACE = pg.Surface((gui.SCREEN_WIDTH, gui.SCREEN_HEIGHT))
+    return _FRAME_SURFACE
+
+
+def _load_moves(source):
+    """Returns (starting board, mainline moves) for a ChessGame, chess.Board, chess.pgn.Game, or PGN path/text."""
+    if isinstance(source, ChessGame):
+        source = source.board
+    if isinstance(source, chess.Board):
+        return source.root(), list(source.move_stack)
+    if isinstance(source, str):
+        if os.path.isfile(source):
+            with open(source) as pgn_file:
+                source = chess.pgn.read_game(pgn_file)
+        else:
+            source = chess.pgn.read_game(io.StringIO(source))
+        if source is None:
+            raise ValueError("No game found in PGN input.")
+    if isinstance(source, chess.pgn.Game):
+        return source.board(), list(source.mainline_moves())
+    raise TypeError(f"Cannot render games from {type(source).__name__}.")
+
+
+def build_frame_specs(source) -> list[FrameSpec]:
+    """One frame for the starting position and one after every ply."""
+    board, moves = _load_moves(source)
+    history_san = []
+    specs = [FrameSpec(0, board.fen(), None, [])]
+    for ply, move in enumerate(moves, start=1):
+        # Same formatting as ChessGame.get_move_history_san, built incrementally instead of replayed per frame
+        san_move = board.san(move)
+        if board.turn == chess.WHITE:
+            history_san.append(f"{board.fullmove_number}. {san_move}")
+        elif not history_san:
+            history_san.append(f"{board.fullmove_number}... {san_move}")
+        else:
+            history_san[-1] += f" {san_move}"
+        board.push(move)
+        specs.append(FrameSpec(ply, board.fen(), move.to_square, list(history_san)))
+    return specs
+
+
+def draw_spec(surface, spec: FrameSpec):
+    game = ChessGame()
+    game.board = chess.Board(spec.fen)
+    gui.draw_frame(surface, game, spec.last_move_square, [], None, spec.move_history_san)
+
+
+def _render_chunk(specs: list[FrameSpec], output_dir: str = None):
+    """Renders `specs`; writes PNGs to `output_dir` and returns their paths, or returns raw RGBX bytes."""
+    surface = init_headless()
+    results = []
+    for spec in specs:
+        draw_spec(surface, spec)
+        if output_dir:
+            path = os.path.join(output_dir, f"frame_{spec.index:04d}.png")
+            pg.image.save(surface, path)
+            results.append(path)
+        else:
+            results.append(pg.image.tobytes(surface, FRAME_BYTES_FORMAT))
+    return results
+
+
+def _chunks(items: list, size: int):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def iter_rendered(specs: list[FrameSpec], output_dir: str = None, workers: int = None):
+    """Renders frames in order and yields them one at a time: PNG paths when
+    `output_dir` is given, raw RGBX bytes otherwise.
+
+    Work is spread over `workers` processes (default: one per CPU) in tasks of up to
+    FRAMES_PER_TASK consecutive frames. Only TASKS_AHEAD_PER_WORKER tasks per worker
+    are in flight, so a slow consumer such as an encoder holds rendering back instead
+    of finished frames piling up in memory. Safe to call after rendering in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(specs))
+    if workers <= 1:
+        for chunk in _chunks(specs, FRAMES_PER_TASK):
+            yield from _render_chunk(chunk, output_dir)
+        return
+    chunk_size = min(FRAMES_PER_TASK, -(-len(specs) // workers)) # Ceiling division: short games still use every worker
+    with _POOL_CONTEXT.Pool(workers, initializer=init_headless) as pool:
+        pending = collections.deque()
+        for chunk in _chunks(specs, chunk_size):
+            if len(pending) >= workers * TASKS_AHEAD_PER_WORKER:
+                yield from pending.popleft().get()
+            pending.append(pool.apply_async(_render_chunk, (chunk, output_dir)))
+        while pending:
+            yield from pending.popleft().get()
+        pool.close()
+        pool.join()
+
+
+def render_specs(specs: list[FrameSpec], output_dir: str = None, workers: int = None) -> list:
+    """Renders all frames in order (see iter_rendered) and returns them as a list."""
+    return list(iter_rendered(specs, output_dir, workers))
+
+
+def render_png_frames(source, output_dir: str, workers: int = None) -> list[str]:
+    """Writes frame_0000.png (start position) to frame_NNNN.png (after the last ply); returns the paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    return render_specs(build_frame_specs(source), output_dir, workers)
+
+
+def render_gif(source, path: str, frame_duration_ms: int = DEFAULT_FRAME_DURATION_MS, workers: int = None):
+    """Writes an animated GIF of the game, encoding each frame as soon as it is rendered. Requires Pillow.
+
+    Frames after the first only store the rectangle that changed since the previous
+    frame, with its own palette, so only the previous frame is kept in memory.
+    """
+    try:
+        from PIL import GifImagePlugin, Image, ImageChops
+    except ImportError as e:
+        raise ImportError("Writing GIFs requires Pillow (pip install Pillow).") from e
+    size = (gui.SCREEN_WIDTH, gui.SCREEN_HEIGHT)
+    previous = None
+    with open(path, "wb") as gif_file:
+        for data in iter_rendered(build_frame_specs(source), None, workers):
+            frame = Image.frombytes("RGB", size, data, "raw", FRAME_BYTES_FORMAT)
+            if previous is None:
+                image = frame.convert("P", palette=Image.Palette.ADAPTIVE)
+                header, _ = GifImagePlugin.getheader(image, None, {"loop": 0}) # Loop forever
+                gif_file.writelines(header)
+                gif_file.writelines(GifImagePlugin.getdata(image, duration=frame_duration_ms))
+            else:
+                # An unchanged frame still gets a 1-pixel patch so it keeps its display time
+                bbox = ImageChops.difference(previous, frame).getbbox() or (0, 0, 1, 1)
+                patch = frame.crop(bbox).convert("P", palette=Image.Palette.ADAPTIVE)
+                gif_file.writelines(GifImagePlugin.getdata(patch, bbox[:2], duration=frame_duration_ms,
+                                                           include_color_table=True))
+            previous = frame
+        gif_file.write(b";") # Trailer
+
+
+def render_video(source, path: str, frame_duration_ms: int = DEFAULT_FRAME_DURATION_MS, workers: int = None):
+    """Writes an MP4 (or any container ffmpeg infers from `path`), piping frames to ffmpeg
+    as they are rendered. Requires the ffmpeg executable."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("Writing videos requires ffmpeg on the PATH.")
+    command = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb0", "-s", f"{gui.SCREEN_WIDTH}x{gui.SCREEN_HEIGHT}",
+        "-framerate", f"{1000 / frame_duration_ms:g}", "-i", "-",
+        "-pix_fmt", "yuv420p", path,
+    ]
+    # Unbuffered stdin: frames are large single writes, and closing never has to flush into a dead pipe
+    with subprocess.Popen(command, stdin=subprocess.PIPE, bufsize=0) as ffmpeg_process:
+        try:
+            for data in iter_rendered(build_frame_specs(source), None, workers):
+                ffmpeg_process.stdin.write(data)
+        except BrokenPipeError:
+            pass # ffmpeg exited early; its exit status below reports the failure
+    if ffmpeg_process.returncode:
+        raise subprocess.CalledProcessError(ffmpeg_process.returncode, command)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a PGN game to PNG frames, a GIF or an MP4.")
+    parser.add_argument("pgn", help="PGN file to render (first game is used)")
+    parser.add_argument("output_dir", nargs="?", help="Directory for per-ply PNG frames")
+    parser.add_argument("--gif", help="Write an animated GIF to this path")
+    parser.add_argument("--mp4", help="Write an MP4 video to this path")
+    parser.add_argument("--frame-ms", type=int, default=DEFAULT_FRAME_DURATION_MS, help="Display time per ply")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    if not (args.output_dir or args.gif or args.mp4):
+        parser.error("Nothing to do: give an output directory, --gif or --mp4.")
+
+    if args.output_dir:
+        paths = render_png_frames(args.pgn, args.output_dir, args.workers)
+        print(f"Wrote {len(paths)} frames to {args.output_dir}")
+    if args.gif:
+        render_gif(args.pgn, args.gif, args.frame_ms, args.workers)
+        print(f"Wrote {args.gif}")
+    if args.mp4:
+        render_video(args.pgn, args.mp4, args.frame_ms, args.workers)
+        print(f"Wrote {args.mp4}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Search-oriented board for the AI: pseudo-legal move generation with lazy legality
+checks, and push/pop that keep a Zobrist hash and a material + piece-square score
+up to date incrementally instead of recomputing them at every node.
+
+The hash is the standard Polyglot Zobrist hash, so it always equals
+chess.polyglot.zobrist_hash() of the same position. It keys the AI's transposition
+table and the position cache. Standard chess only (no Chess960).
+"""
+import chess
+import chess.polyglot
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# Piece-square tables (centipawns) from White's point of view, rank 8 first,
+# from the "Simplified Evaluation Function". Black uses the vertically mirrored square.
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         10,  10,  20,  30,  30,  20,  10,  10,
+          5,   5,  10,  25,  25,  10,   5,   5,
+          0,   0,   0,  20,  20,   0,   0,   0,
+          5,  -5, -10,   0,   0, -10,  -5,   5,
+          5,  10,  10, -20, -20,  10,  10,   5,
+          0,   0,   0,   0,   0,   0,   0,   0,
+    ],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    chess.ROOK: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+          5,  10,  10,  10,  10,  10,  10,   5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+          0,   0,   0,   5,   5,   0,   0,   0,
+    ],
+    chess.QUEEN: [
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+    ],
+    chess.KING: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20,
+    ],
+}
+
+# Signed score (White positive) of a piece on a square: _SQUARE_SCORES[color][piece_type][square]
+_SQUARE_SCORES = {
+    chess.WHITE: {pt: [PIECE_VALUES[pt] + table[chess.square_mirror(sq)] for sq in chess.SQUARES]
+                  for pt, table in PIECE_SQUARE_TABLES.items()},
+    chess.BLACK: {pt: [-(PIECE_VALUES[pt] + table[sq]) for sq in chess.SQUARES]
+                  for pt, table in PIECE_SQUARE_TABLES.items()},
+}
+
+# Polyglot Zobrist keys: _PIECE_KEYS[color][piece_type][square]
+_ZOBRIST_ARRAY = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_PIECE_KEYS = {
+    color: {pt: [_ZOBRIST_ARRAY[64 * ((pt - 1) * 2 + int(color)) + sq] for sq in chess.SQUARES]
+            for pt in chess.PIECE_TYPES}
+    for color in chess.COLORS
+}
+_CASTLING_KEYS = ((chess.BB_H1, _ZOBRIST_ARRAY[768]), (chess.BB_A1, _ZOBRIST_ARRAY[769]),
+                  (chess.BB_H8, _ZOBRIST_ARRAY[770]), (chess.BB_A8, _ZOBRIST_ARRAY[771]))
+_TURN_KEY = _ZOBRIST_ARRAY[780]
+_EP_HASHER = chess.polyglot.ZobristHasher(_ZOBRIST_ARRAY)
+
+
+def evaluate_board(board: chess.Board) -> int:
+    """Material + piece-square score from White's point of view, computed from scratch."""
+    score = 0
+    for square, piece in board.piece_map().items():
+        score += _SQUARE_SCORES[piece.color][piece.piece_type][square]
+    return score
+
+
+def _castling_key(castling_rights: int) -> int:
+    key = 0
+    for mask, castling_key in _CASTLING_KEYS:
+        if castling_rights & mask:
+            key ^= castling_key
+    return key
+
+
+class SearchBoard:
+    """A private copy of a ChessGame's (or Board's) position for search inner loops.
+
+    Moves passed to push() are not validated: they must come from pseudo_legal_moves()
+    (or be legal). try_push() makes a pseudo-legal move and takes it back again if it
+    leaves the mover's king in check, so legality is only paid for moves actually searched.
+    """
+
+    def __init__(self, source):
+        board = source.board if hasattr(source, "board") else source # ChessGame or chess.Board
+        if board.chess960:
+            raise ValueError("SearchBoard supports standard chess only.")
+        self.board = board.copy(stack=False)
+        self.score = evaluate_board(self.board)
+        self._ep_key = _EP_HASHER.hash_ep_square(self.board)
+        self._castling_key = _castling_key(self.board.clean_castling_rights())
+        self.hash = chess.polyglot.zobrist_hash(self.board)
+        self._undo_stack = []
+
+    @property
+    def turn(self) -> chess.Color:
+        return self.board.turn
+
+    def evaluate(self) -> int:
+        """Incrementally maintained score from the side to move's point of view."""
+        return self.score if self.board.turn == chess.WHITE else -self.score
+
+    def pseudo_legal_moves(self):
+        return self.board.generate_pseudo_legal_moves()
+
+    def is_legal(self, move: chess.Move) -> bool:
+        """Legality check for a pseudo-legal move, without making it."""
+        return not self.board.is_into_check(move)
+
+    def is_check(self) -> bool:
+        return self.board.is_check()
+
+    def has_legal_move(self) -> bool:
+        return any(self.board.generate_legal_moves())
+
+    def push(self, move: chess.Move):
+        """Makes a (pseudo-)legal move and updates the hash and score from the pieces it moves."""
+        board = self.board
+        mover = board.turn
+        from_square, to_square = move.from_square, move.to_square
+        piece_type = board.piece_type_at(from_square)
+        captured_type = board.piece_type_at(to_square)
+        placed_type = move.promotion or piece_type
+        mover_keys, mover_scores = _PIECE_KEYS[mover], _SQUARE_SCORES[mover]
+
+        h = self.hash ^ _TURN_KEY ^ self._ep_key ^ mover_keys[piece_type][from_square] ^ mover_keys[placed_type][to_square]
+        score = self.score - mover_scores[piece_type][from_square] + mover_scores[placed_type][to_square]
+        if captured_type:
+            h ^= _PIECE_KEYS[not mover][captured_type][to_square]
+            score -= _SQUARE_SCORES[not mover][captured_type][to_square]
+        elif piece_type == chess.PAWN and to_square == board.ep_square:
+            # En passant: the captured pawn is behind the target square
+            captured_square = to_square - 8 if mover == chess.WHITE else to_square + 8
+            h ^= _PIECE_KEYS[not mover][chess.PAWN][captured_square]
+            score -= _SQUARE_SCORES[not mover][chess.PAWN][captured_square]
+        elif piece_type == chess.KING and abs(from_square - to_square) == 2:
+            # Castling: the rook jumps from the corner to the square the king crossed
+            rook_from = to_square + 1 if to_square > from_square else to_square - 2
+            rook_to = (from_square + to_square) // 2
+            rook_keys, rook_scores = mover_keys[chess.ROOK], mover_scores[chess.ROOK]
+            h ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+            score += rook_scores[rook_to] - rook_scores[rook_from]
+
+        castling_rights = board.castling_rights
+        self._undo_stack.append((self.hash, self.score, self._ep_key, self._castling_key))
+        board.push(move)
+
+        # push() cleans the castling rights, so the raw mask is safe to hash from here on
+        if board.castling_rights != castling_rights:
+            h ^= self._castling_key
+            self._castling_key = _castling_key(board.castling_rights)
+            h ^= self._castling_key
+        self._ep_key = _EP_HASHER.hash_ep_square(board) if board.ep_square is not None else 0
+        self.hash = h ^ self._ep_key
+        self.score = score
+
+    def try_push(self, move: chess.Move) -> bool:
+        """Makes a pseudo-legal move if it is legal. Returns False (board unchanged) otherwise."""
+        self.push(move)
+        if self.board.was_into_check():
+            self.pop()
+            return False
+        return True
+
+    def pop(self) -> chess.Move:
+        self.hash, self.score, self._ep_key, self._castling_key = self._undo_stack.pop()
+        return self.board.pop()
+
+    def perft(self, depth: int) -> int:
+        """Counts leaf nodes `depth` plies deep using pseudo-legal generation and try_push."""
+        if depth == 0:
+            return 1
+        nodes = 0
+        for move in list(self.pseudo_legal_moves()):
+            if self.try_push(move):
+                nodes += self.perft(depth - 1)
+                self.pop()
+        return nodes
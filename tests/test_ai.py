@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import time
+
+# Adjust path to import from src (src modules import each other by bare name)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import chess.polyglot
+import ai
+from chess_game import ChessGame
+from chess_clock import TimeBudget
+from ai import choose_ai_move
+from search_board import SearchBoard
+
+FAST_BUDGET = TimeBudget(soft=0.2, hard=0.5)
+
+class TestChooseAiMove(unittest.TestCase):
+
+    def setUp(self):
+        self.game = ChessGame()
+
+    def test_returns_a_legal_move(self):
+        move_uci = choose_ai_move(self.game, FAST_BUDGET)
+        self.assertIn(move_uci, self.game.get_legal_moves())
+
+    def test_finds_mate_in_one(self):
+        self.game.board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        self.assertEqual(choose_ai_move(self.game, FAST_BUDGET), "a1a8")
+
+    def test_takes_hanging_queen(self):
+        self.game.board = chess.Board("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+        self.assertEqual(choose_ai_move(self.game, FAST_BUDGET), "d1d5")
+
+    def test_forced_move_is_immediate(self):
+        self.game.board = chess.Board("7k/8/8/8/8/8/6q1/K7 w - - 0 1")
+        start = time.perf_counter()
+        self.assertEqual(choose_ai_move(self.game, TimeBudget(soft=5, hard=10)), "a1b1")
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_respects_hard_limit(self):
+        start = time.perf_counter()
+        choose_ai_move(self.game, TimeBudget(soft=0.1, hard=0.3))
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+    def test_no_legal_moves(self):
+        self.game.board = chess.Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1") # Stalemate
+        self.assertIsNone(choose_ai_move(self.game, FAST_BUDGET))
+
+    def test_does_not_modify_game(self):
+        fen = self.game.board.fen()
+        choose_ai_move(self.game, FAST_BUDGET)
+        self.assertEqual(self.game.board.fen(), fen)
+
+    def test_transposition_table_keeps_search_results(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        def search(table):
+            return ai._search_root(SearchBoard(board), list(board.legal_moves), 3, float("inf"), table)
+        table = ai._new_table()
+        with_table = search(table)
+        self.assertEqual(with_table, search(ai._new_table(0))) # One slot: effectively no table
+        # Entries are keyed by SearchBoard's incremental hash, i.e. each position's Polyglot hash
+        board.push(with_table[0])
+        key = chess.polyglot.zobrist_hash(board)
+        self.assertEqual(table[key & (len(table) - 1)][0], key)
+
+    def test_move_encoding_round_trip(self):
+        for move in (chess.Move.from_uci("e2e4"), chess.Move.from_uci("a7a8q"), chess.Move.from_uci("h2h1n")):
+            self.assertEqual(ai._decode_move(ai._encode_move(move)), move)
+
+if __name__ == '__main__':
+    unittest.main()
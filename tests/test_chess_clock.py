@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from src (src modules import each other by bare name)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+from chess_clock import ChessClock, TimeControl, allocate_move_time, format_clock_time
+
+class FakeTimer:
+    """Manually advanced stand-in for time.perf_counter."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTimeControl(unittest.TestCase):
+
+    def test_parse_base_plus_increment(self):
+        tc = TimeControl.parse("5+3")
+        self.assertEqual(tc.base, 300)
+        self.assertEqual(tc.increment, 3)
+        self.assertIsNone(tc.moves_per_period)
+        self.assertEqual(str(tc), "5+3")
+
+    def test_parse_moves_per_period(self):
+        tc = TimeControl.parse("40/90+30")
+        self.assertEqual(tc.moves_per_period, 40)
+        self.assertEqual(tc.base, 90 * 60)
+        self.assertEqual(tc.increment, 30)
+
+    def test_parse_rejects_garbage(self):
+        for text in ["", "abc", "0+2", "5+-1", "0/5", "inf", "nan", "5+inf", "40/nan"]:
+            with self.assertRaises(ValueError, msg=text):
+                TimeControl.parse(text)
+
+class TestChessClock(unittest.TestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.clock = ChessClock(TimeControl(60, increment=2), timer=self.timer)
+
+    def test_running_side_loses_time_and_gains_increment(self):
+        self.clock.start(chess.WHITE)
+        self.timer.now += 10
+        self.assertAlmostEqual(self.clock.remaining(chess.WHITE), 50)
+        self.assertAlmostEqual(self.clock.remaining(chess.BLACK), 60)
+        self.assertAlmostEqual(self.clock.press(), 10)
+        self.assertAlmostEqual(self.clock.remaining(chess.WHITE), 52)
+        self.assertEqual(self.clock.running_color, chess.BLACK)
+
+    def test_period_bonus_after_moves_per_period(self):
+        clock = ChessClock(TimeControl(60, moves_per_period=2), timer=self.timer)
+        clock.start(chess.WHITE)
+        for _ in range(4): # Two moves each
+            self.timer.now += 5
+            clock.press()
+        self.assertAlmostEqual(clock.remaining(chess.WHITE), 60 - 10 + 60)
+        self.assertEqual(clock.moves_to_go(chess.WHITE), 2)
+
+    def test_flag_fall(self):
+        board = chess.Board()
+        self.clock.start(chess.WHITE)
+        self.assertIsNone(self.clock.timeout_message(board))
+        self.timer.now += 61
+        self.assertTrue(self.clock.flagged(chess.WHITE))
+        self.assertEqual(self.clock.timeout_message(board), "White lost on time. Black wins.")
+
+    def test_flag_fall_against_bare_king_is_draw(self):
+        board = chess.Board("4k3/8/8/8/8/8/8/4K2Q w - - 0 1")
+        self.clock.start(chess.WHITE)
+        self.timer.now += 61
+        self.assertEqual(self.clock.timeout_message(board), "Draw: White flagged, no mating material")
+
+    def test_format_clock_time(self):
+        self.assertEqual(format_clock_time(3725), "1:02:05")
+        self.assertEqual(format_clock_time(65), "1:05")
+        self.assertEqual(format_clock_time(9.25), "0:09.2")
+
+class TestAllocateMoveTime(unittest.TestCase):
+
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.clock = ChessClock(TimeControl(300, increment=2), timer=self.timer)
+        self.clock.start(chess.WHITE)
+
+    def test_budget_is_a_fraction_of_the_clock(self):
+        budget = allocate_move_time(self.clock, chess.Board())
+        self.assertGreater(budget.soft, 0)
+        self.assertLessEqual(budget.soft, budget.hard)
+        self.assertLess(budget.hard, self.clock.remaining(chess.WHITE) / 2)
+
+    def test_forced_move_gets_no_time(self):
+        # The queen covers everything but b1
+        board = chess.Board("7k/8/8/8/8/8/6q1/K7 w - - 0 1")
+        self.assertEqual(board.legal_moves.count(), 1)
+        budget = allocate_move_time(self.clock, board)
+        self.assertEqual(budget.hard, 0)
+
+    def test_check_gets_more_time(self):
+        quiet = chess.Board("4k3/8/8/8/8/6r1/8/4K3 w - - 0 1")
+        in_check = chess.Board("4k3/8/8/8/8/8/8/4K2r w - - 0 1")
+        self.assertFalse(quiet.is_check())
+        self.assertTrue(in_check.is_check())
+        self.assertGreater(allocate_move_time(self.clock, in_check).soft,
+                           allocate_move_time(self.clock, quiet).soft)
+
+if __name__ == '__main__':
+    unittest.main()
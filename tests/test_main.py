@@ -5,6 +5,12 @@ from unittest.mock import patch, call # For mocking input and print
 
 # Adjust path to import from src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+from chess_game import ChessGame
+from chess_clock import ChessClock, TimeControl
+from main import tui_game_loop
 
 # main.py is not designed to be easily unit-testable for its TUI loop.
 # We would need to refactor tui_game_loop to take mockable input/output streams
@@ -50,5 +56,35 @@ class TestMainInteractions(unittest.TestCase):
     #     pass
 
 
+class TestTuiClock(unittest.TestCase):
+
+    def setUp(self):
+        # Fool's mate is one move away: Black to play Qh4#
+        self.game = ChessGame()
+        for move_uci in ["f2f3", "e7e5", "g2g4"]:
+            self.game.make_move(move_uci)
+        self.now = 0.0
+        self.chess_clock = ChessClock(TimeControl(base=60), timer=lambda: self.now)
+
+    def play_after(self, seconds, move_san):
+        def slow_input(prompt):
+            self.now += seconds
+            return move_san
+        with patch('builtins.input', side_effect=slow_input), patch('builtins.print') as mock_print:
+            tui_game_loop(self.game, "human", chess_clock=self.chess_clock)
+        return [printed_call.args[0] for printed_call in mock_print.call_args_list if printed_call.args]
+
+    def test_move_after_flag_fall_is_not_played(self):
+        output = self.play_after(61, "Qh4#")
+        self.assertIn("Game over: Black lost on time. White wins.", output)
+        self.assertEqual(len(self.game.board.move_stack), 3)
+        self.assertNotIn("Checkmate! Black wins.", output)
+
+    def test_move_in_time_is_played(self):
+        output = self.play_after(30, "Qh4#")
+        self.assertIn("Checkmate! Black wins.", output)
+        self.assertTrue(self.game.board.is_checkmate())
+        self.assertAlmostEqual(self.chess_clock.remaining(chess.BLACK), 30)
+
 if __name__ == '__main__':
     unittest.main()
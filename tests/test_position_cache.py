@@ -0,0 +1,165 @@
+import unittest
+import sys
+import os
+import multiprocessing
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# Adjust path to import from src (src modules import each other by bare name)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import chess.polyglot
+import position_cache
+from position_cache import PositionCache, to_signed_key
+from chess_game import ChessGame
+from chess_clock import TimeBudget
+from ai import choose_ai_move
+
+def _write_entries(path, start, count):
+    cache = PositionCache(path)
+    for key in range(start, start + count):
+        cache.put_legal_moves(key, ["e2e4"])
+    cache.close()
+
+class TestPositionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "positions.sqlite")
+        self.cache = PositionCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_signed_key_range(self):
+        self.assertEqual(to_signed_key(5), 5)
+        self.assertEqual(to_signed_key((1 << 64) - 1), -1)
+        self.assertEqual(ChessGame().position_key(), to_signed_key(chess.polyglot.zobrist_hash(chess.Board())))
+
+    def test_round_trip_and_stats(self):
+        self.assertIsNone(self.cache.get_legal_moves(42))
+        self.cache.put_legal_moves(42, ["e2e4", "d2d4"])
+        self.assertEqual(self.cache.get_legal_moves(42), ["e2e4", "d2d4"])
+        self.assertIsNone(self.cache.get_search(42)) # Same row, but no search result yet
+        self.cache.put_search(42, "e2e4", 30, 1)
+        self.assertEqual(self.cache.get_search(42), ("e2e4", 30, 1))
+        self.assertEqual(self.cache.get_legal_moves(42), ["e2e4", "d2d4"]) # Not overwritten by the search result
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 2))
+        self.assertEqual(stats["hit_rate"], 0.6)
+
+    def test_persists_across_instances(self):
+        self.cache.put_search(7, "e2e4", 30, 3)
+        self.cache.close()
+        with PositionCache(self.path) as reopened:
+            self.assertEqual(reopened.get_search(7), ("e2e4", 30, 3))
+
+    def test_shallower_search_does_not_overwrite(self):
+        self.cache.put_search(7, "e2e4", 30, 4)
+        self.cache.put_search(7, "d2d4", 10, 2)
+        self.assertEqual(self.cache.get_search(7), ("e2e4", 30, 4))
+        self.cache.put_search(7, "g1f3", 20, 5)
+        self.assertEqual(self.cache.get_search(7), ("g1f3", 20, 5))
+
+    def test_lru_eviction_bounds_size(self):
+        cache = PositionCache(self.path, max_entries=10)
+        for key in range(20):
+            cache.put_legal_moves(key, ["e2e4"])
+        cache.evict()
+        self.assertLessEqual(len(cache), 10)
+        self.assertIsNotNone(cache.get_legal_moves(19)) # Most recent entries survive
+        self.assertIsNone(cache.get_legal_moves(0))
+        cache.close()
+
+    def test_age_eviction(self):
+        cache = PositionCache(self.path, max_age=0.05)
+        cache.put_legal_moves(1, ["e2e4"])
+        time.sleep(0.1)
+        cache.put_legal_moves(2, ["e2e4"])
+        cache.evict()
+        self.assertIsNone(cache.get_legal_moves(1))
+        self.assertEqual(cache.get_legal_moves(2), ["e2e4"])
+        cache.close()
+
+    def test_concurrent_writers(self):
+        processes = [multiprocessing.Process(target=_write_entries, args=(self.path, i * 500, 500)) for i in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(len(self.cache), 1500)
+
+    def test_chess_game_uses_cache(self):
+        game = ChessGame(cache=self.cache)
+        uncached = ChessGame()
+        for game_under_test in (game, uncached):
+            for move_uci in ["f2f3", "e7e5", "g2g4", "d8h4"]:
+                game_under_test.make_move(move_uci)
+        self.assertEqual(game.get_game_status(), "Checkmate") # Status is always computed live
+        self.assertEqual(game.get_legal_moves(), uncached.get_legal_moves())
+        self.assertEqual(game.get_legal_moves(), uncached.get_legal_moves())
+        self.assertEqual(self.cache.stats()["by_kind"]["legal_moves"], {"hits": 1, "misses": 1})
+
+    def test_ai_reuses_cached_search(self):
+        game = ChessGame(cache=self.cache)
+        budget = TimeBudget(soft=10, hard=10)
+        first = choose_ai_move(game, budget, max_depth=2)
+        self.assertEqual(self.cache.get_search(game.position_key())[2], 2)
+        self.assertEqual(choose_ai_move(game, budget, max_depth=2), first)
+        self.assertEqual(self.cache.stats()["by_kind"]["search"], {"hits": 2, "misses": 1})
+
+    def test_cache_pickles_without_connection(self):
+        import pickle
+        clone = pickle.loads(pickle.dumps(self.cache))
+        clone.put_legal_moves(3, ["e2e4"])
+        self.assertEqual(self.cache.get_legal_moves(3), ["e2e4"])
+        clone.close()
+
+    def test_corrupt_database_is_a_miss(self):
+        self.cache.put_legal_moves(3, ["e2e4"])
+        self.cache.close()
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        with open(self.path, "wb") as db_file:
+            db_file.write(b"not a database" * 1000)
+        self.assertIsNone(self.cache.get_legal_moves(3))
+        self.cache.put_legal_moves(3, ["e2e4"]) # No-op, no exception
+        game = ChessGame(cache=self.cache)
+        self.assertEqual(game.get_game_status(), "Ongoing")
+        self.assertEqual(len(game.get_legal_moves()), 20)
+        self.assertGreater(self.cache.stats()["errors"], 0)
+        with self.assertRaises(sqlite3.DatabaseError):
+            PositionCache(self.path) # Opening still reports a broken file
+
+    def test_locked_database_skips_writes(self):
+        with mock.patch.object(position_cache, "BUSY_TIMEOUT_MS", 50):
+            cache = PositionCache(self.path)
+        cache.put_legal_moves(1, ["e2e4"])
+        other_writer = sqlite3.connect(self.path, isolation_level=None)
+        other_writer.execute("BEGIN IMMEDIATE")
+        try:
+            cache.put_legal_moves(2, ["e2e4"]) # Times out on the lock and is dropped
+            self.assertEqual(cache.get_legal_moves(1), ["e2e4"]) # WAL readers are not blocked
+        finally:
+            other_writer.execute("ROLLBACK")
+            other_writer.close()
+        self.assertIsNone(cache.get_legal_moves(2))
+        self.assertEqual(cache.stats()["errors"], 1)
+        cache.close()
+
+    def test_usable_from_other_threads(self):
+        thread = threading.Thread(target=self.cache.put_legal_moves, args=(5, ["e2e4"]))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.cache.get_legal_moves(5), ["e2e4"])
+        self.assertEqual(self.cache.stats()["errors"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import importlib.util
+import sys
+import os
+import tempfile
+
+# Adjust path to import from src (src modules import each other by bare name)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import pygame as pg
+import render
+import gui
+from chess_game import ChessGame
+from chess_clock import ChessClock, TimeControl
+
+SCHOLARS_MATE_PGN = """[Event "Test"]
+
+1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0
+"""
+
+class TestHeadlessRender(unittest.TestCase):
+
+    def setUp(self):
+        self.game = ChessGame()
+        for move_uci in ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5"]:
+            self.game.make_move(move_uci)
+
+    def test_frame_specs_cover_every_ply(self):
+        specs = render.build_frame_specs(self.game)
+        self.assertEqual(len(specs), 6)
+        self.assertEqual(specs[0].fen, chess.Board().fen())
+        self.assertIsNone(specs[0].last_move_square)
+        self.assertEqual(specs[-1].fen, self.game.board.fen())
+        self.assertEqual(specs[-1].last_move_square, chess.B5)
+
+    def test_frame_history_matches_game_history(self):
+        specs = render.build_frame_specs(self.game)
+        self.assertEqual(specs[-1].move_history_san, self.game.get_move_history_san())
+        self.assertEqual(specs[1].move_history_san, ["1. e4"])
+
+    def test_pgn_text_input(self):
+        specs = render.build_frame_specs(SCHOLARS_MATE_PGN)
+        self.assertEqual(len(specs), 8)
+        self.assertTrue(chess.Board(specs[-1].fen).is_checkmate())
+
+    def test_invalid_source(self):
+        with self.assertRaises(TypeError):
+            render.build_frame_specs(42)
+
+    def test_png_frames(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            paths = render.render_png_frames(self.game, output_dir, workers=1)
+            self.assertEqual([os.path.basename(path) for path in paths], [f"frame_{i:04d}.png" for i in range(6)])
+            image = pg.image.load(paths[-1])
+            self.assertEqual(image.get_size(), (gui.SCREEN_WIDTH, gui.SCREEN_HEIGHT))
+
+    def test_parallel_render_matches_serial(self):
+        specs = render.build_frame_specs(self.game)
+        self.assertEqual(render.render_specs(specs, None, workers=2), render.render_specs(specs, None, workers=1))
+
+    def test_parallel_render_after_serial_render(self):
+        # Serial rendering initialises SDL in this process; the worker pool must still start cleanly
+        specs = render.build_frame_specs(self.game)
+        serial = render.render_specs(specs, None, workers=1)
+        self.assertEqual(render.render_specs(specs, None, workers=2), serial)
+
+    def test_iter_rendered_yields_frames_in_order(self):
+        specs = render.build_frame_specs(self.game)
+        frames = render.iter_rendered(specs, None, workers=2)
+        self.assertNotIsInstance(frames, list)
+        self.assertEqual(list(frames), render.render_specs(specs, None, workers=1))
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "Pillow is not installed")
+    def test_gif_frames_match_rendered_frames(self):
+        from PIL import Image, ImageChops, ImageSequence
+        specs = render.build_frame_specs(self.game)
+        size = (gui.SCREEN_WIDTH, gui.SCREEN_HEIGHT)
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, "game.gif")
+            render.render_gif(self.game, path, frame_duration_ms=300, workers=1)
+            with Image.open(path) as gif:
+                self.assertEqual(gif.n_frames, len(specs))
+                self.assertEqual(gif.info.get("loop"), 0)
+                for frame, data in zip(ImageSequence.Iterator(gif), render.render_specs(specs, None, workers=1)):
+                    self.assertEqual(frame.info["duration"], 300)
+                    expected = Image.frombytes("RGB", size, data, "raw", render.FRAME_BYTES_FORMAT)
+                    difference = ImageChops.difference(frame.convert("RGB"), expected)
+                    self.assertLessEqual(max(band.getextrema()[1] for band in difference.split()), 8)
+
+class TestInfoBar(unittest.TestCase):
+
+    def setUp(self):
+        render.init_headless()
+        self.surface = pg.Surface((gui.SCREEN_WIDTH, gui.SCREEN_HEIGHT))
+        self.now = 0.0
+        self.chess_clock = ChessClock(TimeControl(base=60), timer=lambda: self.now)
+        self.chess_clock.start(chess.WHITE)
+
+    def draw_bar(self, game, chess_clock):
+        self.surface.fill(gui.BLACK_COLOR)
+        gui.draw_info_bar(self.surface, game, chess_clock)
+        return self.surface.subsurface(pg.Rect(0, gui.BOARD_HEIGHT, gui.BOARD_WIDTH, gui.INFO_HEIGHT)).copy()
+
+    def test_clocks_are_dropped_when_game_is_over(self):
+        game = ChessGame()
+        for move_uci in ["f2f3", "e7e5", "g2g4", "d8h4"]:
+            game.make_move(move_uci)
+        with_clock = self.draw_bar(game, self.chess_clock)
+        without_clock = self.draw_bar(game, None)
+        self.assertEqual(pg.image.tobytes(with_clock, "RGB"), pg.image.tobytes(without_clock, "RGB"))
+
+    def test_timeout_message_fits_in_bar(self):
+        game = ChessGame()
+        game.board = chess.Board("4k3/8/8/8/8/8/8/4K2Q w - - 0 1")
+        self.now += 61
+        bar = self.draw_bar(game, self.chess_clock)
+        lit_columns = [x for x in range(bar.get_width())
+                       if any(bar.get_at((x, y))[:3] != gui.BLACK_COLOR for y in range(bar.get_height()))]
+        self.assertGreaterEqual(lit_columns[0], gui.INFO_PADDING)
+        self.assertLess(lit_columns[-1], bar.get_width() - gui.INFO_PADDING)
+
+    def test_text_shrinks_to_max_width(self):
+        text = "Draw: Draw by seventyfive moves rule"
+        self.assertLessEqual(gui.render_text(gui.INFO_FONT, text, gui.WHITE_COLOR, 200).get_width(), 200)
+        full = gui.render_text(gui.INFO_FONT, text, gui.WHITE_COLOR)
+        self.assertEqual(gui.render_text(gui.INFO_FONT, text, gui.WHITE_COLOR, 1000).get_size(), full.get_size())
+
+if __name__ == '__main__':
+    unittest.main()
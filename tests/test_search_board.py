@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from src (src modules import each other by bare name)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import chess
+import chess.polyglot
+from chess_game import ChessGame
+from search_board import SearchBoard, evaluate_board
+
+# Standard perft test positions with published node counts (shallow depths to keep the suite fast)
+PERFT_POSITIONS = [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902]),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039]), # "Kiwipete"
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812]),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486]),
+]
+
+def reference_perft(board: chess.Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += reference_perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+class TestSearchBoard(unittest.TestCase):
+
+    def assert_consistent(self, search_board: SearchBoard, depth: int):
+        """Walks the tree checking the incremental hash and score against full recomputation."""
+        self.assertEqual(search_board.hash, chess.polyglot.zobrist_hash(search_board.board), search_board.board.fen())
+        self.assertEqual(search_board.score, evaluate_board(search_board.board), search_board.board.fen())
+        if depth == 0:
+            return
+        for move in list(search_board.pseudo_legal_moves()):
+            if search_board.try_push(move):
+                self.assert_consistent(search_board, depth - 1)
+                search_board.pop()
+
+    def test_perft_matches_published_counts(self):
+        for fen, counts in PERFT_POSITIONS:
+            search_board = SearchBoard(chess.Board(fen))
+            for depth, expected in enumerate(counts, start=1):
+                self.assertEqual(search_board.perft(depth), expected, f"{fen} depth {depth}")
+
+    def test_perft_matches_python_chess(self):
+        for fen, counts in PERFT_POSITIONS:
+            board = chess.Board(fen)
+            self.assertEqual(SearchBoard(board).perft(2), reference_perft(board, 2), fen)
+
+    def test_incremental_hash_and_score(self):
+        # Covers castling, en passant and promotions (with and without capture)
+        for fen, _ in PERFT_POSITIONS[1:4]:
+            self.assert_consistent(SearchBoard(chess.Board(fen)), 2)
+
+    def test_en_passant_hash(self):
+        search_board = SearchBoard(chess.Board("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1"))
+        search_board.push(chess.Move.from_uci("e2e4")) # Black pawn on d4 can capture en passant
+        self.assertEqual(search_board.hash, chess.polyglot.zobrist_hash(search_board.board))
+        search_board.push(chess.Move.from_uci("d4e3"))
+        self.assertEqual(search_board.hash, chess.polyglot.zobrist_hash(search_board.board))
+        self.assertEqual(search_board.score, evaluate_board(search_board.board))
+
+    def test_pop_restores_state(self):
+        search_board = SearchBoard(ChessGame())
+        fen, zobrist, score = search_board.board.fen(), search_board.hash, search_board.score
+        for move_uci in ["e2e4", "d7d5", "e4d5", "d8d5"]:
+            search_board.push(chess.Move.from_uci(move_uci))
+        for _ in range(4):
+            search_board.pop()
+        self.assertEqual((search_board.board.fen(), search_board.hash, search_board.score), (fen, zobrist, score))
+
+    def test_try_push_rejects_moves_into_check(self):
+        search_board = SearchBoard(chess.Board("4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"))
+        fen, zobrist = search_board.board.fen(), search_board.hash
+        self.assertFalse(search_board.try_push(chess.Move.from_uci("e1d2")))
+        self.assertFalse(search_board.is_legal(chess.Move.from_uci("e1f2")))
+        self.assertEqual((search_board.board.fen(), search_board.hash), (fen, zobrist))
+        self.assertTrue(search_board.try_push(chess.Move.from_uci("e1e2")))
+
+    def test_does_not_modify_source_game(self):
+        game = ChessGame()
+        search_board = SearchBoard(game)
+        search_board.push(chess.Move.from_uci("e2e4"))
+        self.assertEqual(game.board.fen(), chess.Board().fen())
+
+    def test_evaluate_is_side_to_move_relative(self):
+        search_board = SearchBoard(chess.Board("4k3/8/8/8/8/8/8/3QK3 w - - 0 1"))
+        self.assertGreater(search_board.evaluate(), 0)
+        search_board.push(chess.Move.from_uci("e1e2"))
+        self.assertLess(search_board.evaluate(), 0)
+
+if __name__ == '__main__':
+    unittest.main()